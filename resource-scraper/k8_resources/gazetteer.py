@@ -0,0 +1,433 @@
+# Offline US gazetteer used to canonicalize scraped location fields.
+#
+# The bundled table (data/us_places.csv) is compiled on first use into a
+# compact binary index of fixed-width records that is memory-mapped and
+# searched with bisection, so lookups never load the table into Python
+# objects and never touch the network.
+
+import csv
+import hashlib
+import mmap
+import os
+import re
+import struct
+import tempfile
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+DEFAULT_TABLE_PATH = os.path.join(DATA_DIR, "us_places.csv")
+
+INDEX_MAGIC = b"K8GZ"
+INDEX_VERSION = 1
+
+# magic, version, number of place records, number of zip records
+HEADER = struct.Struct("=4sHII")
+# normalized city key, state, display name, zip code, latitude, longitude
+PLACE_RECORD = struct.Struct("=32s2s32s5sff")
+# zip code, place record number
+ZIP_RECORD = struct.Struct("=5sI")
+
+PLACE_SORT_KEY_LENGTH = 34  # key + state
+
+STATES = {
+    "AL": "Alabama", "AK": "Alaska", "AZ": "Arizona", "AR": "Arkansas",
+    "CA": "California", "CO": "Colorado", "CT": "Connecticut", "DE": "Delaware",
+    "DC": "District of Columbia", "FL": "Florida", "GA": "Georgia", "HI": "Hawaii",
+    "ID": "Idaho", "IL": "Illinois", "IN": "Indiana", "IA": "Iowa",
+    "KS": "Kansas", "KY": "Kentucky", "LA": "Louisiana", "ME": "Maine",
+    "MD": "Maryland", "MA": "Massachusetts", "MI": "Michigan", "MN": "Minnesota",
+    "MS": "Mississippi", "MO": "Missouri", "MT": "Montana", "NE": "Nebraska",
+    "NV": "Nevada", "NH": "New Hampshire", "NJ": "New Jersey", "NM": "New Mexico",
+    "NY": "New York", "NC": "North Carolina", "ND": "North Dakota", "OH": "Ohio",
+    "OK": "Oklahoma", "OR": "Oregon", "PA": "Pennsylvania", "PR": "Puerto Rico",
+    "RI": "Rhode Island", "SC": "South Carolina", "SD": "South Dakota",
+    "TN": "Tennessee", "TX": "Texas", "UT": "Utah", "VT": "Vermont",
+    "VA": "Virginia", "WA": "Washington", "WV": "West Virginia",
+    "WI": "Wisconsin", "WY": "Wyoming",
+}
+STATE_NAMES = {name.lower(): abbr for abbr, name in STATES.items()}
+STATE_NAMES["washington dc"] = "DC"
+STATE_NAMES["d c"] = "DC"
+
+# First three ZIP digits (inclusive ranges) to state
+ZIP3_RANGES = [
+    (6, 9, "PR"), (10, 27, "MA"), (28, 29, "RI"), (30, 38, "NH"),
+    (39, 49, "ME"), (50, 54, "VT"), (55, 55, "MA"), (56, 59, "VT"),
+    (60, 69, "CT"), (70, 89, "NJ"), (100, 149, "NY"), (150, 196, "PA"),
+    (197, 199, "DE"), (200, 205, "DC"), (206, 219, "MD"), (220, 246, "VA"),
+    (247, 268, "WV"), (270, 289, "NC"), (290, 299, "SC"), (300, 319, "GA"),
+    (320, 349, "FL"), (350, 369, "AL"), (370, 385, "TN"), (386, 397, "MS"),
+    (398, 399, "GA"), (400, 427, "KY"), (430, 459, "OH"), (460, 479, "IN"),
+    (480, 499, "MI"), (500, 528, "IA"), (530, 549, "WI"), (550, 567, "MN"),
+    (569, 569, "DC"), (570, 577, "SD"), (580, 588, "ND"), (590, 599, "MT"),
+    (600, 629, "IL"), (630, 658, "MO"), (660, 679, "KS"), (680, 693, "NE"),
+    (700, 714, "LA"), (716, 729, "AR"), (730, 749, "OK"), (750, 799, "TX"),
+    (800, 816, "CO"), (820, 831, "WY"), (832, 838, "ID"), (840, 847, "UT"),
+    (850, 865, "AZ"), (870, 884, "NM"), (885, 885, "TX"), (889, 898, "NV"),
+    (900, 961, "CA"), (967, 968, "HI"), (970, 979, "OR"), (980, 994, "WA"),
+    (995, 999, "AK"),
+]
+
+CITY_ALIASES = {
+    "nyc": "new york",
+    "new york city": "new york",
+    "manhattan": "new york",
+    "philly": "philadelphia",
+    "washington dc": "washington",
+}
+CITY_PREFIXES = {"st": "saint", "ste": "sainte", "ft": "fort", "mt": "mount"}
+
+# Words that mark the street part of an address ("123 Main St NW Atlanta")
+STREET_WORDS = {
+    "street", "st", "avenue", "ave", "road", "rd", "boulevard", "blvd",
+    "drive", "dr", "lane", "ln", "place", "pl", "court", "ct", "way",
+    "circle", "cir", "terrace", "ter", "highway", "hwy", "parkway", "pkwy",
+    "suite", "ste", "nw", "ne", "sw", "se",
+}
+
+# ASCII digits only: Unicode digits would slip through \d into the index
+ZIP_PATTERN = re.compile(r"\b([0-9]{5})(?:-[0-9]{4})?\b")
+NON_WORD_PATTERN = re.compile(r"[^a-z0-9\s]")
+
+
+class Place(NamedTuple):
+    city: Optional[str]
+    state: Optional[str]
+    zip_code: Optional[str]
+    latitude: Optional[float]
+    longitude: Optional[float]
+
+
+def normalize_city(name):
+    """Normalize a city name into its lookup key"""
+    if not name:
+        return ""
+    text = NON_WORD_PATTERN.sub(" ", name.lower().replace(".", "").replace("'", ""))
+    words = text.split()
+    if words and words[0] in CITY_PREFIXES:
+        words[0] = CITY_PREFIXES[words[0]]
+    key = " ".join(words)
+    return CITY_ALIASES.get(key, key)
+
+
+def normalize_state(value):
+    """Return the two-letter code for a state abbreviation or name"""
+    if not value:
+        return None
+    text = value.strip().rstrip(".")
+    if len(text) == 2 and text.upper() in STATES:
+        return text.upper()
+    return STATE_NAMES.get(" ".join(NON_WORD_PATTERN.sub(" ", text.lower()).split()))
+
+
+def state_for_zip(zip_code):
+    """Return the state a ZIP code belongs to, based on its first three digits"""
+    if not zip_code or len(zip_code) < 3 or not zip_code[:3].isdigit():
+        return None
+    prefix = int(zip_code[:3])
+    for low, high, state in ZIP3_RANGES:
+        if low <= prefix <= high:
+            return state
+    return None
+
+
+def build_index(table_path, index_path):
+    """Compile the CSV place table into the binary index format"""
+    places = []
+    with open(table_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            key = normalize_city(row["city"]).encode("utf-8")[:32]
+            places.append((
+                key.ljust(32, b"\0"),
+                row["state"].strip().upper().encode("ascii"),
+                row["city"].strip().encode("utf-8")[:32],
+                row["zip_code"].strip().encode("ascii"),
+                float(row["latitude"]),
+                float(row["longitude"]),
+            ))
+    places.sort(key=lambda place: place[:2] + (place[3],))
+    zips = sorted((place[3], number) for number, place in enumerate(places))
+
+    # Each crawl process may build the index at once; give every builder its
+    # own temp file and let the atomic rename pick a winner
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(index_path)),
+        prefix=os.path.basename(index_path) + ".",
+        suffix=".tmp",
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(INDEX_MAGIC, INDEX_VERSION, len(places), len(zips)))
+            for place in places:
+                f.write(PLACE_RECORD.pack(*place))
+            for zip_code, number in zips:
+                f.write(ZIP_RECORD.pack(zip_code, number))
+        os.replace(tmp_path, index_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return index_path
+
+
+def _decode(value):
+    return value.rstrip(b"\0").decode("utf-8")
+
+
+class Gazetteer:
+    """Memory-mapped lookup of US cities, states and ZIP codes"""
+
+    def __init__(self, table_path=DEFAULT_TABLE_PATH, index_path=None, cache_size=4096):
+        self.table_path = table_path
+        self.index_path = self._ensure_index(table_path, index_path)
+
+        with open(self.index_path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._place_count, self._zip_count = HEADER.unpack_from(self._mm, 0)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            self._mm.close()
+            raise ValueError(f"Not a gazetteer index: {self.index_path}")
+        self._places_offset = HEADER.size
+        self._zips_offset = self._places_offset + self._place_count * PLACE_RECORD.size
+
+        # Scraped pages repeat the same handful of addresses, so memoize
+        # whole resolutions rather than individual index probes
+        self._resolve_cached = lru_cache(maxsize=cache_size)(self._resolve)
+
+    @staticmethod
+    def _ensure_index(table_path, index_path):
+        """Return a fresh index path, rebuilding the index if it is stale"""
+        if index_path is None:
+            index_path = os.path.splitext(table_path)[0] + ".idx"
+        # Key the fallback on the table's full path so two tables that share a
+        # basename never reuse each other's index
+        table_hash = hashlib.sha1(os.path.abspath(table_path).encode("utf-8")).hexdigest()[:12]
+        candidates = [
+            index_path,
+            os.path.join(
+                tempfile.gettempdir(),
+                f"k8_resources_{table_hash}_{os.path.basename(index_path)}",
+            ),
+        ]
+        table_mtime = os.path.getmtime(table_path)
+        for candidate in candidates:
+            if os.path.exists(candidate) and os.path.getmtime(candidate) >= table_mtime:
+                return candidate
+        for candidate in candidates:
+            try:
+                return build_index(table_path, candidate)
+            except OSError:
+                continue
+        raise OSError(f"Could not write gazetteer index for {table_path}")
+
+    def close(self):
+        self._mm.close()
+
+    def cache_info(self):
+        return self._resolve_cached.cache_info()
+
+    # Index access
+
+    def _place_at(self, number):
+        return PLACE_RECORD.unpack_from(self._mm, self._places_offset + number * PLACE_RECORD.size)
+
+    def _place_sort_key(self, number):
+        offset = self._places_offset + number * PLACE_RECORD.size
+        return self._mm[offset:offset + PLACE_SORT_KEY_LENGTH]
+
+    def _zip_at(self, number):
+        return ZIP_RECORD.unpack_from(self._mm, self._zips_offset + number * ZIP_RECORD.size)
+
+    def _bisect_places(self, target):
+        low, high = 0, self._place_count
+        while low < high:
+            mid = (low + high) // 2
+            if self._place_sort_key(mid)[:len(target)] < target:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def _bisect_zips(self, target):
+        low, high = 0, self._zip_count
+        while low < high:
+            mid = (low + high) // 2
+            if self._zip_at(mid)[0][:len(target)] < target:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def _to_place(self, record):
+        _, state, name, zip_code, latitude, longitude = record
+        return Place(
+            _decode(name),
+            state.decode("ascii"),
+            zip_code.decode("ascii"),
+            round(latitude, 4),
+            round(longitude, 4),
+        )
+
+    def lookup_city(self, city, state=None):
+        """Find a city, optionally within a state. Ambiguous names return None.
+
+        A table may list a city once per ZIP; those rows are merged into one
+        place at their centroid.
+        """
+        key = normalize_city(city).encode("utf-8")[:32]
+        if not key:
+            return None
+        target = key.ljust(32, b"\0")
+        if state:
+            target += state.encode("ascii")
+        number = self._bisect_places(target)
+        matches = []
+        while number < self._place_count and self._place_sort_key(number).startswith(target):
+            matches.append(self._place_at(number))
+            if matches[-1][1] != matches[0][1]:
+                # Same name in more than one state
+                return None
+            number += 1
+        if not matches:
+            return None
+        if len(matches) == 1:
+            return self._to_place(matches[0])
+        place = self._to_place(matches[0])
+        return place._replace(
+            zip_code=None,
+            latitude=round(sum(match[4] for match in matches) / len(matches), 4),
+            longitude=round(sum(match[5] for match in matches) / len(matches), 4),
+        )
+
+    def lookup_zip(self, zip_code):
+        """Find the place listed for exactly this ZIP code"""
+        if not zip_code:
+            return None
+        target = zip_code.encode("ascii")
+        number = self._bisect_zips(target)
+        if number < self._zip_count:
+            found_zip, place_number = self._zip_at(number)
+            if found_zip == target:
+                return self._to_place(self._place_at(place_number))
+        return None
+
+    # Resolution
+
+    def resolve(self, address=None, city=None, state=None, zip_code=None):
+        """Resolve an address and/or its parts into a canonical Place"""
+        return self._resolve_cached(
+            _clean(address), _clean(city), _clean(state), _clean(zip_code)
+        )
+
+    def resolve_many(self, queries):
+        """Resolve a batch of query dicts, looking up each distinct query once"""
+        keys = [
+            (
+                _clean(query.get("address")),
+                _clean(query.get("city")),
+                _clean(query.get("state")),
+                _clean(query.get("zip_code")),
+            )
+            for query in queries
+        ]
+        resolved = {key: self._resolve_cached(*key) for key in set(keys)}
+        return [resolved[key] for key in keys]
+
+    def _resolve(self, address, city, state, zip_code):
+        parsed_city, parsed_state, parsed_zip = parse_address(address)
+        city = city or parsed_city
+        state = normalize_state(state) or parsed_state
+        zip_match = ZIP_PATTERN.search(zip_code or "")
+        zip_code = zip_match.group(1) if zip_match else parsed_zip
+
+        zip_state = state_for_zip(zip_code)
+        if zip_code and state and zip_state != state:
+            # A ZIP from another state is more likely a stray number
+            zip_code = None
+        state = state or zip_state
+
+        place = None
+        candidates = _city_candidates(city) if city else []
+        for candidate in candidates:
+            place = self.lookup_city(candidate, state)
+            if place:
+                break
+        if place is None and zip_code and not candidates:
+            # Only an exact ZIP row may supply a city; any other ZIP just
+            # gives its state (via state_for_zip above), never a nearby city
+            place = self.lookup_zip(zip_code)
+
+        if place is None:
+            if not state:
+                return None
+            page_city = _title(candidates[-1]) if candidates else None
+            return Place(page_city, state, zip_code, None, None)
+        # The table ZIP only locates the city; never report it as the page's
+        return Place(place.city, place.state, zip_code, place.latitude, place.longitude)
+
+
+def parse_address(address):
+    """Split a free-form US address into (city, state, zip)"""
+    if not address:
+        return None, None, None
+    zip_code = None
+    zip_matches = list(ZIP_PATTERN.finditer(address))
+    if zip_matches:
+        last = zip_matches[-1]
+        zip_code = last.group(1)
+        address = address[:last.start()] + address[last.end():]
+
+    segments = [segment.strip() for segment in address.split(",") if segment.strip()]
+    state = None
+    if len(segments) > 1:
+        state = normalize_state(segments[-1])
+        if state:
+            segments.pop()
+    if not state and segments:
+        words = segments[-1].split()
+        # Only trust bare abbreviations written in capitals ("Atlanta GA")
+        if len(words) > 1 and len(words[-1]) == 2 and words[-1].isupper():
+            state = normalize_state(words[-1])
+            if state:
+                segments[-1] = " ".join(words[:-1])
+    city = segments[-1] if segments else None
+    return city, state, zip_code
+
+
+def _city_candidates(text):
+    """City names to try for a city segment.
+
+    A plain place name is only ever tried whole, so "North Charleston" never
+    becomes "Charleston". When the segment carries a street part, the words
+    after it are the city.
+    """
+    words = text.split()
+    street_end = None
+    for i, word in enumerate(words):
+        bare = word.lower().strip(".#")
+        if any(char.isdigit() for char in word) or bare in STREET_WORDS:
+            street_end = i
+    if street_end is None:
+        return [text]
+
+    candidates = []
+    if words[street_end].lower().strip(".") in CITY_PREFIXES and street_end + 1 < len(words):
+        # "... Main St St. Louis": the last "St." may start the city name
+        candidates.append(" ".join(words[street_end:]))
+    if street_end + 1 < len(words):
+        candidates.append(" ".join(words[street_end + 1:]))
+    return candidates
+
+
+def _clean(value):
+    if value is None:
+        return None
+    value = " ".join(str(value).split())
+    return value or None
+
+
+def _title(city):
+    if not city or any(char.isdigit() for char in city):
+        return None
+    return city if not city.islower() and not city.isupper() else city.title()
@@ -33,6 +33,8 @@ class K8ResourceItem(scrapy.Item):
     city = scrapy.Field()
     state = scrapy.Field()
     zip_code = scrapy.Field()
+    latitude = scrapy.Field()
+    longitude = scrapy.Field()
     
     # Contact info
     phone = scrapy.Field()
@@ -4,10 +4,122 @@
 # See: https://docs.scrapy.org/en/latest/topics/item-pipeline.html
 
 
+import logging
+
 # useful for handling different item types with a single interface
 from itemadapter import ItemAdapter
+from twisted.internet import defer, task
+
+from k8_resources.gazetteer import DEFAULT_TABLE_PATH, Gazetteer
+
+logger = logging.getLogger(__name__)
 
 
 class K8ResourcesPipeline:
     def process_item(self, item, spider):
         return item
+
+
+class AddressResolutionPipeline:
+    """Canonicalize city, state, ZIP and coordinates against the offline gazetteer.
+
+    Items are held briefly and resolved together when the buffer reaches
+    GAZETTEER_BATCH_SIZE, every GAZETTEER_FLUSH_INTERVAL seconds, and when
+    the spider closes, so repeated addresses are looked up once per flush.
+    """
+
+    def __init__(self, gazetteer, batch_size=50, flush_interval=1.0):
+        self.gazetteer = gazetteer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pending = []
+        self.flush_loop = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        gazetteer = Gazetteer(
+            table_path=settings.get("GAZETTEER_TABLE_PATH") or DEFAULT_TABLE_PATH,
+            index_path=settings.get("GAZETTEER_INDEX_PATH"),
+            cache_size=settings.getint("GAZETTEER_CACHE_SIZE", 4096),
+        )
+        return cls(
+            gazetteer,
+            batch_size=settings.getint("GAZETTEER_BATCH_SIZE", 50),
+            flush_interval=settings.getfloat("GAZETTEER_FLUSH_INTERVAL", 1.0),
+        )
+
+    def open_spider(self, spider):
+        # The timer keeps a quiet crawl from holding items indefinitely;
+        # the engine never goes idle while items are still pending
+        self.flush_loop = task.LoopingCall(self.flush)
+        self.flush_loop.start(self.flush_interval, now=False)
+
+    def close_spider(self, spider):
+        if self.flush_loop and self.flush_loop.running:
+            self.flush_loop.stop()
+        self.flush()
+        spider.logger.info("Gazetteer cache: %s" % (self.gazetteer.cache_info(),))
+        self.gazetteer.close()
+
+    def process_item(self, item, spider):
+        d = defer.Deferred()
+        self.pending.append((item, d))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+        return d
+
+    def flush(self):
+        if not self.pending:
+            return
+        batch, self.pending = self.pending, []
+        try:
+            self.resolve_batch([item for item, _ in batch])
+        except Exception:
+            # Raising here would also kill the flush timer
+            logger.exception("Address resolution failed for a batch of %d items", len(batch))
+        finally:
+            # Every Deferred must fire, or the engine never goes idle and the
+            # spider never closes
+            for item, d in batch:
+                d.callback(item)
+
+    def resolve_batch(self, items):
+        adapters = [ItemAdapter(item) for item in items]
+        queries = [
+            {
+                'address': adapter.get('address'),
+                'city': adapter.get('city'),
+                'state': adapter.get('state'),
+                'zip_code': adapter.get('zip_code'),
+            }
+            for adapter in adapters
+        ]
+        try:
+            places = self.gazetteer.resolve_many(queries)
+        except Exception:
+            logger.exception("Batch address resolution failed, resolving items one by one")
+            places = [self.resolve_one(query) for query in queries]
+
+        for adapter, place in zip(adapters, places):
+            try:
+                if place is not None:
+                    self.apply_place(adapter, place)
+            except Exception:
+                logger.exception("Could not update item location from %r", place)
+
+    def apply_place(self, adapter, place):
+        """Write the resolved location, skipping fields the item doesn't declare"""
+        for field in ('city', 'state', 'zip_code', 'latitude', 'longitude'):
+            try:
+                adapter[field] = getattr(place, field)
+            except KeyError:
+                continue
+
+    def resolve_one(self, query):
+        """Resolve a single query, leaving the item unchanged if it fails"""
+        try:
+            return self.gazetteer.resolve(**query)
+        except Exception:
+            logger.exception("Could not resolve address %r", query)
+            return None
@@ -61,6 +61,16 @@ DOWNLOAD_DELAY = 1
 #ITEM_PIPELINES = {
 #    "k8_resources.pipelines.K8ResourcesPipeline": 300,
 #}
+ITEM_PIPELINES = {
+    "k8_resources.pipelines.AddressResolutionPipeline": 300,
+}
+
+# Offline address resolution (see k8_resources/gazetteer.py)
+#GAZETTEER_TABLE_PATH = None  # defaults to the bundled data/us_places.csv
+#GAZETTEER_INDEX_PATH = None  # defaults to the table path with an .idx suffix
+GAZETTEER_CACHE_SIZE = 4096
+GAZETTEER_BATCH_SIZE = 50
+GAZETTEER_FLUSH_INTERVAL = 1.0
 
 # Enable and configure the AutoThrottle extension (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/autothrottle.html
@@ -254,42 +254,69 @@ class CommunityResourcesSpider(scrapy.Spider):
     def extract_location(self, response):
         """Extract location information"""
         text = response.text
-        
-        # Look for address patterns
+        name = self.extract_location_name(response)
+
+        # Look for address patterns, most complete first.
+        # City/state/ZIP are canonicalized later by AddressResolutionPipeline.
         address_patterns = [
+            # Full street address on one line: the house number must start the
+            # street, which is made of words, ordinals ("5th") and unit numbers,
+            # so stray numbers and text on earlier lines never lead the address
+            r"(?<![\w-])([0-9]+(?:[ \t]+(?:[0-9]+(?:st|nd|rd|th)|(?:Suite|Ste\.?|Unit|#)[ \t]*[0-9A-Za-z-]+|[A-Za-z][A-Za-z.']*))+,[ \t]*[A-Za-z][A-Za-z. \t]*,[ \t]*[A-Z]{2}[ \t]+[0-9]{5}(?:-[0-9]{4})?)",
             r'(\d+\s+[A-Za-z\s]+(?:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Drive|Dr|Lane|Ln|Place|Pl|Court|Ct|Way|Circle|Cir|Terrace|Ter))',
-            r'([A-Za-z\s]+,\s*[A-Z]{2}\s+\d{5}(?:-\d{4})?)',
+            r'([A-Za-z\s]+,\s*[A-Z]{2}\s+[0-9]{5}(?:-[0-9]{4})?)',
             r'(\d+\s+[A-Za-z\s]+,\s*[A-Za-z\s]+,\s*[A-Z]{2})'
         ]
-        
+
         for pattern in address_patterns:
             match = re.search(pattern, text)
             if match:
                 address = match.group(1).strip()
+                zip_match = re.search(r'\b([0-9]{5})(?:-[0-9]{4})?$', address)
+                zip_code = zip_match.group(1) if zip_match else None
                 # Extract city and state
-                city_state_match = re.search(r'([A-Za-z\s]+),\s*([A-Z]{2})', address)
+                city_state_match = re.search(r'([A-Za-z\s]+),\s*([A-Z]{2})\b', address)
                 if city_state_match:
                     return {
+                        'name': name,
                         'address': address,
                         'city': city_state_match.group(1).strip(),
                         'state': city_state_match.group(2),
-                        'zip': None
+                        'zip': zip_code
                     }
                 return {
+                    'name': name,
                     'address': address,
                     'city': None,
                     'state': None,
-                    'zip': None
+                    'zip': zip_code
                 }
-        
+
         return {
-            'name': None,
+            'name': name,
             'address': None,
             'city': None,
             'state': None,
             'zip': None
         }
 
+    def extract_location_name(self, response):
+        """Extract the venue or branch name"""
+        selectors = [
+            '[itemprop="location"] [itemprop="name"]::text',
+            '.location-name::text',
+            '.venue-name::text',
+            '.venue::text',
+            '.branch-name::text',
+            '[class*="location"] h3::text'
+        ]
+
+        for selector in selectors:
+            name = response.css(selector).get()
+            if name and name.strip():
+                return name.strip()
+        return None
+
     def extract_phone(self, response):
         """Extract phone number"""
         # Look for phone numbers in various formats
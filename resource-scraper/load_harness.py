@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Load harness for the K-8 Community Resources Spider
+
+Starts a local farm of synthetic sites shaped like the spider's start_urls
+domains and crawls it with CommunityResourcesSpider. Real hostnames are kept
+(so per-domain slots and robots.txt behave as in production) but are resolved
+to the farm, and unknown hosts fail to resolve, so no live site is contacted.
+
+The farm is one level deep: CommunityResourcesSpider only follows links from
+its start pages, so each site serves a start page linking to --fan-out detail
+pages, and detail pages carry no further links.
+
+    python load_harness.py --scale 10 --fan-out 4 --seed 1
+    python load_harness.py --scale 100 -s DOWNLOAD_DELAY=0.25 --json report.json
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from scrapy.crawler import CrawlerProcess
+from scrapy.utils.project import get_project_settings
+from twisted.internet import defer, error, task
+from twisted.internet.interfaces import IResolverSimple
+from zope.interface import implementer
+
+from k8_resources.gazetteer import DEFAULT_TABLE_PATH
+from k8_resources.spiders.community_resources import CommunityResourcesSpider
+
+PAGE_PREFIX = "/youth-programs/"
+PRIVATE_PREFIX = "/private/"
+STALL_PROBE_INTERVAL = 0.05
+# Client-side delay is measured at download start, the farm sees arrival
+POLITENESS_TOLERANCE = 0.05
+
+FILLER = (
+    "Our after school enrichment program helps youth ages 6-12 learn, "
+    "explore and build confidence with caring mentors and tutors. "
+)
+
+
+# Mock site farm
+
+def farm_hosts(start_urls, scale):
+    """Map each farm host to the path of its start page"""
+    hosts = {}
+    for url in start_urls:
+        parsed = urlparse(url)
+        hosts[parsed.hostname] = parsed.path or "/"
+        for i in range(1, scale):
+            hosts[f"s{i}.{parsed.hostname}"] = parsed.path or "/"
+    return hosts
+
+
+def load_places():
+    with open(DEFAULT_TABLE_PATH, newline="", encoding="utf-8") as f:
+        return [row for row in csv.DictReader(f)]
+
+
+def render_page(host, path, config, places):
+    """Render a deterministic page for host/path; start pages link to detail pages"""
+    rng = random.Random(f"{host}{path}")
+    page_id = path[len(PAGE_PREFIX):] if path.startswith(PAGE_PREFIX) else ""
+    place = rng.choice(places)
+
+    links = []
+    if not page_id:
+        for k in range(config["fan_out"]):
+            if k % 2:
+                links.append(f"{PAGE_PREFIX}{k}")
+            else:
+                links.append(f"http://{config['authority'](host)}{PAGE_PREFIX}{k}")
+        if config["robots_disallow"]:
+            links.append(f"{PRIVATE_PREFIX}youth-root")
+
+    body = [
+        "<html><head><title>Youth Programs</title></head><body>",
+        f"<h1>{host} youth program {page_id or 'home'}</h1>",
+        f'<p class="description">{FILLER}</p>',
+        f'<div class="location"><h3>{place["city"]} Community Center</h3>',
+        f'<p>{rng.randint(10, 9999)} Main Street, {place["city"]}, '
+        f'{place["state"]} {place["zip_code"]}</p></div>',
+        f"<p>Call (555) {rng.randint(200, 999)}-{rng.randint(1000, 9999)} "
+        f"or email programs@{host}</p>",
+    ]
+    body.extend(f'<a href="{link}">Youth program</a>' for link in links)
+
+    target = rng.randint(config["page_bytes_min"], config["page_bytes_max"])
+    size = sum(len(part) for part in body)
+    if size < target:
+        body.append(f"<p>{(FILLER * (target // len(FILLER) + 1))[:target - size]}</p>")
+    body.append("</body></html>")
+    return "".join(body).encode("utf-8")
+
+
+def make_handler(config, hosts, places, log):
+    attempts = defaultdict(int)
+    attempts_lock = threading.Lock()
+
+    def request_rng(host, path):
+        """Latency/fault dice for one request.
+
+        With a seed, the outcome depends only on (host, path, attempt), not on
+        thread timing, so runs are repeatable and retries can still succeed.
+        """
+        if config["seed"] is None:
+            return random.Random()
+        with attempts_lock:
+            attempts[host, path] += 1
+            attempt = attempts[host, path]
+        return random.Random(f"{config['seed']}:{host}{path}:{attempt}")
+
+    class FarmHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            started = time.time()
+            host = (self.headers.get("Host") or "").split(":")[0]
+            path = urlparse(self.path).path
+            status, body, headers = self.respond(host, path)
+
+            self.send_response(status)
+            for name, value in headers:
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            log.write(f"{host}\t{path}\t{status}\t{started:.6f}\t{time.time():.6f}\n")
+
+        def respond(self, host, path):
+            if host not in hosts:
+                return 404, b"unknown host", []
+            rng = request_rng(host, path)
+            time.sleep(rng.uniform(config["latency_min"], config["latency_max"]))
+
+            if path == "/robots.txt":
+                robots = "User-agent: *\n"
+                if config["robots_disallow"]:
+                    robots += f"Disallow: {PRIVATE_PREFIX}\n"
+                return 200, robots.encode("utf-8"), [("Content-Type", "text/plain")]
+
+            roll = rng.random()
+            if roll < config["error_rate"]:
+                return 500, b"server error", [("Content-Type", "text/plain")]
+            if roll < config["error_rate"] + config["throttle_rate"]:
+                return 429, b"too many requests", [("Retry-After", "1")]
+
+            page = render_page(host, path, config, places)
+            return 200, page, [("Content-Type", "text/html; charset=utf-8")]
+
+    return FarmHandler
+
+
+def serve_farm(config, hosts, log_path, port_queue):
+    """Farm process entry point: serve every host on one port, routed by Host"""
+    places = load_places()
+    with open(log_path, "w", buffering=1) as log:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), None)
+        port = server.server_address[1]
+        config = dict(config, authority=lambda host: f"{host}:{port}")
+        server.RequestHandlerClass = make_handler(config, hosts, places, log)
+        server.daemon_threads = True
+        server.request_queue_size = 1024
+        port_queue.put(port)
+        server.serve_forever()
+
+
+def start_farm(config, hosts, log_path):
+    port_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=serve_farm, args=(config, hosts, log_path, port_queue), daemon=True
+    )
+    process.start()
+    return process, port_queue.get(timeout=30)
+
+
+# Crawler side
+
+@implementer(IResolverSimple)
+class FarmResolver:
+    """DNS resolver that points farm hosts at localhost and refuses everything else"""
+
+    def __init__(self, reactor, hosts):
+        self.reactor = reactor
+        self.hosts = set(hosts)
+
+    @classmethod
+    def from_crawler(cls, crawler, reactor):
+        return cls(reactor, crawler.settings.getlist("FARM_HOSTS"))
+
+    def install_on_reactor(self):
+        self.reactor.installResolver(self)
+
+    def getHostByName(self, name, timeout=()):
+        if name in self.hosts:
+            return defer.succeed("127.0.0.1")
+        return defer.fail(error.DNSLookupError(f"{name} is not part of the farm"))
+
+
+def current_rss_kb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class ReactorProbe:
+    """Measure event loop stalls and sample memory while the crawl runs"""
+
+    def __init__(self, interval=STALL_PROBE_INTERVAL):
+        self.interval = interval
+        self.stall_total = 0.0
+        self.stall_max = 0.0
+        self.long_stalls = 0
+        self.rss_start_kb = current_rss_kb()
+        self.rss_peak_kb = self.rss_start_kb
+        self.last = None
+        self.loop = None
+
+    def start(self):
+        self.last = time.monotonic()
+        self.loop = task.LoopingCall(self.tick)
+        self.loop.start(self.interval, now=False)
+
+    def stop(self):
+        if self.loop and self.loop.running:
+            self.loop.stop()
+
+    def tick(self):
+        now = time.monotonic()
+        stall = now - self.last - self.interval
+        self.last = now
+        if stall > 0.005:
+            self.stall_total += stall
+            self.stall_max = max(self.stall_max, stall)
+            if stall > 0.1:
+                self.long_stalls += 1
+        self.rss_peak_kb = max(self.rss_peak_kb, current_rss_kb())
+
+
+class CrawlFailed(Exception):
+    """The crawl errored, or closed with a finish_reason other than finished"""
+
+
+def run_crawl(start_urls, hosts, overrides):
+    settings = get_project_settings()
+    settings.set("DNS_RESOLVER", FarmResolver)
+    settings.set("FARM_HOSTS", sorted(hosts))
+    settings.set("TELNETCONSOLE_ENABLED", False)
+    settings.set("LOG_LEVEL", "INFO")
+    for key, value in overrides.items():
+        settings.set(key, value, priority="cmdline")
+
+    process = CrawlerProcess(settings)
+    crawler = process.create_crawler(CommunityResourcesSpider)
+    failures = []
+    d = process.crawl(crawler, start_urls=start_urls)
+    d.addErrback(failures.append)
+
+    probe = ReactorProbe()
+    probe.start()
+    started = time.monotonic()
+    process.start()
+    elapsed = time.monotonic() - started
+    probe.stop()
+
+    if failures:
+        failure = failures[0]
+        raise CrawlFailed(f"crawl raised {failure.type.__name__}: {failure.getErrorMessage()}")
+    stats = crawler.stats.get_stats()
+    finish_reason = stats.get("finish_reason")
+    if finish_reason != "finished":
+        raise CrawlFailed(f"crawl did not finish cleanly (finish_reason={finish_reason!r})")
+    return stats, crawler.settings, probe, elapsed
+
+
+# Reporting
+
+def politeness_report(log_path, settings):
+    """Check per-domain delay, concurrency and robots.txt compliance from the farm log"""
+    delay = settings.getfloat("DOWNLOAD_DELAY")
+    if settings.getbool("RANDOMIZE_DOWNLOAD_DELAY"):
+        delay *= 0.5
+    max_concurrency = settings.getint("CONCURRENT_REQUESTS_PER_DOMAIN")
+    obey_robots = settings.getbool("ROBOTSTXT_OBEY")
+
+    requests = defaultdict(list)
+    with open(log_path) as f:
+        for line in f:
+            host, path, status, started, finished = line.rstrip("\n").split("\t")
+            requests[host].append((float(started), float(finished), path))
+
+    report = {}
+    for host, entries in sorted(requests.items()):
+        entries.sort()
+        starts = [started for started, _, _ in entries]
+        gaps = [b - a for a, b in zip(starts, starts[1:])]
+
+        events = sorted(
+            [(started, 1) for started, _, _ in entries]
+            + [(finished, -1) for _, finished, _ in entries]
+        )
+        in_flight = peak = 0
+        for _, change in events:
+            in_flight += change
+            peak = max(peak, in_flight)
+
+        delay_violations = sum(1 for gap in gaps if gap < delay - POLITENESS_TOLERANCE)
+        robots_violations = sum(
+            1 for _, _, path in entries if obey_robots and path.startswith(PRIVATE_PREFIX)
+        )
+        report[host] = {
+            "requests": len(entries),
+            "min_gap": round(min(gaps), 3) if gaps else None,
+            "peak_concurrency": peak,
+            "delay_violations": delay_violations,
+            "robots_violations": robots_violations,
+            "compliant": (
+                delay_violations == 0
+                and robots_violations == 0
+                and peak <= max_concurrency
+            ),
+        }
+    return report
+
+
+def build_report(stats, settings, probe, elapsed, politeness):
+    requests = stats.get("downloader/request_count", 0)
+    items = stats.get("item_scraped_count", 0)
+    return {
+        "elapsed_seconds": round(elapsed, 2),
+        "requests": requests,
+        "items": items,
+        "requests_per_second": round(requests / elapsed, 2) if elapsed else 0,
+        "items_per_second": round(items / elapsed, 2) if elapsed else 0,
+        "responses_429": stats.get("downloader/response_status_count/429", 0),
+        "responses_500": stats.get("downloader/response_status_count/500", 0),
+        "retries": stats.get("retry/count", 0),
+        "robots_forbidden": stats.get("robotstxt/forbidden", 0),
+        "reactor_stall_seconds": round(probe.stall_total, 3),
+        "reactor_max_stall_seconds": round(probe.stall_max, 3),
+        "reactor_stalls_over_100ms": probe.long_stalls,
+        "rss_start_mb": round(probe.rss_start_kb / 1024, 1),
+        "rss_peak_mb": round(probe.rss_peak_kb / 1024, 1),
+        "rss_growth_mb": round((probe.rss_peak_kb - probe.rss_start_kb) / 1024, 1),
+        "domains": len(politeness),
+        "compliant_domains": sum(1 for host in politeness.values() if host["compliant"]),
+        "politeness": politeness,
+    }
+
+
+def print_report(report):
+    print("\n=== Crawl load report ===")
+    for key, value in report.items():
+        if key != "politeness":
+            print(f"{key:>28}: {value}")
+    offenders = {host: r for host, r in report["politeness"].items() if not r["compliant"]}
+    if offenders:
+        print("\nDomains violating politeness:")
+        for host, r in offenders.items():
+            print(
+                f"  {host}: min_gap={r['min_gap']} peak_concurrency={r['peak_concurrency']} "
+                f"delay_violations={r['delay_violations']} robots_violations={r['robots_violations']}"
+            )
+
+
+def parse_overrides(pairs):
+    overrides = {}
+    for pair in pairs:
+        key, _, value = pair.partition("=")
+        overrides[key] = value
+    return overrides
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=1, help="sites per start_urls domain")
+    parser.add_argument("--fan-out", type=int, default=4, help="detail pages linked from each start page")
+    parser.add_argument("--page-bytes", type=int, nargs=2, default=[4000, 40000], metavar=("MIN", "MAX"))
+    parser.add_argument("--latency-ms", type=float, nargs=2, default=[20, 200], metavar=("MIN", "MAX"))
+    parser.add_argument("--error-rate", type=float, default=0.02, help="fraction of pages answered with 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.02, help="fraction of pages answered with 429")
+    parser.add_argument("--no-robots-disallow", action="store_true", help="serve a permissive robots.txt")
+    parser.add_argument("--seed", type=int, help="make latency and error/429 injection repeatable")
+    parser.add_argument("-s", "--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="override a Scrapy setting")
+    parser.add_argument("--json", help="also write the report to this path")
+    args = parser.parse_args()
+
+    hosts = farm_hosts(CommunityResourcesSpider.start_urls, args.scale)
+    config = {
+        "fan_out": args.fan_out,
+        "page_bytes_min": args.page_bytes[0],
+        "page_bytes_max": args.page_bytes[1],
+        "latency_min": args.latency_ms[0] / 1000,
+        "latency_max": args.latency_ms[1] / 1000,
+        "error_rate": args.error_rate,
+        "throttle_rate": args.throttle_rate,
+        "robots_disallow": not args.no_robots_disallow,
+        "seed": args.seed,
+    }
+    log_fd, log_path = tempfile.mkstemp(prefix="farm_requests_", suffix=".log")
+    os.close(log_fd)
+    try:
+        farm, port = start_farm(config, hosts, log_path)
+        print(f"Mock farm serving {len(hosts)} sites on 127.0.0.1:{port}")
+        try:
+            start_urls = [f"http://{host}:{port}{path}" for host, path in hosts.items()]
+            stats, settings, probe, elapsed = run_crawl(start_urls, hosts, parse_overrides(args.set))
+        except CrawlFailed as exc:
+            sys.exit(f"Load test failed: {exc}")
+        finally:
+            farm.terminate()
+            farm.join()
+        politeness = politeness_report(log_path, settings)
+    finally:
+        os.remove(log_path)
+
+    report = build_report(stats, settings, probe, elapsed, politeness)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
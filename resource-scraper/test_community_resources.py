@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for CommunityResourcesSpider location extraction
+"""
+
+import pytest
+
+pytest.importorskip("scrapy")
+
+from scrapy.http import HtmlResponse
+
+from k8_resources.spiders.community_resources import CommunityResourcesSpider
+
+
+def make_response(body):
+    return HtmlResponse(
+        url="https://example.org/programs/youth",
+        body=f"<html><body>{body}</body></html>".encode("utf-8"),
+        encoding="utf-8",
+    )
+
+
+@pytest.fixture
+def spider():
+    return CommunityResourcesSpider()
+
+
+def test_full_address_with_zip(spider):
+    location = spider.extract_location(make_response(
+        '<div class="location"><h3>Central Library</h3>'
+        '<p>100 Peachtree St NW, Atlanta, GA 30303-1234</p></div>'
+    ))
+    assert location == {
+        'name': "Central Library",
+        'address': "100 Peachtree St NW, Atlanta, GA 30303-1234",
+        'city': "Atlanta",
+        'state': "GA",
+        'zip': "30303",
+    }
+
+
+def test_text_before_address_is_not_captured(spider):
+    location = spider.extract_location(make_response(
+        "<p>Grades 3 to 5\nOpen daily\n100 Main St, Atlanta, GA 30303</p>"
+    ))
+    assert location['address'] == "100 Main St, Atlanta, GA 30303"
+
+    location = spider.extract_location(make_response(
+        "<p>Serving 2024 families since 1990 in 100 Peachtree St NW, Atlanta, GA 30303</p>"
+    ))
+    assert location['address'] == "100 Peachtree St NW, Atlanta, GA 30303"
+
+
+def test_unicode_digits_are_not_a_zip(spider):
+    location = spider.extract_location(make_response("<p>Atlanta, GA ３０３０３</p>"))
+    assert location['zip'] is None
+
+
+def test_no_address(spider):
+    location = spider.extract_location(make_response("<p>Join our reading club!</p>"))
+    assert location == {'name': None, 'address': None, 'city': None, 'state': None, 'zip': None}
+
+
+@pytest.mark.parametrize("body, name", [
+    ('<div itemprop="location"><span itemprop="name">Eastside Branch</span></div>', "Eastside Branch"),
+    ('<span class="location-name"> Westside YMCA </span>', "Westside YMCA"),
+    ('<span class="venue">Community Hall</span>', "Community Hall"),
+    ('<p class="branch-name">Main Branch</p>', "Main Branch"),
+    ("<p>No venue here</p>", None),
+])
+def test_extract_location_name(spider, body, name):
+    assert spider.extract_location_name(make_response(body)) == name
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Tests for the offline gazetteer used by AddressResolutionPipeline
+"""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from k8_resources.gazetteer import DEFAULT_TABLE_PATH, Gazetteer, Place, parse_address
+
+
+@pytest.fixture
+def gazetteer(tmp_path):
+    g = Gazetteer(index_path=str(tmp_path / "us_places.idx"))
+    yield g
+    g.close()
+
+
+@pytest.mark.parametrize("address, expected", [
+    ("100 Peachtree St. NW, Atlanta, GA 30303-1234", ("Atlanta", "GA", "30303")),
+    ("Chicago, IL 60602", ("Chicago", "IL", "60602")),
+    ("4805 Mt Hope Dr, Baltimore, MD", ("Baltimore", "MD", None)),
+    ("123 Main Street Atlanta GA", ("123 Main Street Atlanta", "GA", None)),
+    ("St. Louis, Missouri", ("St. Louis", "MO", None)),
+    ("Visit us today", ("Visit us today", None, None)),
+    (None, (None, None, None)),
+])
+def test_parse_address(address, expected):
+    assert parse_address(address) == expected
+
+
+def test_resolves_full_address(gazetteer):
+    assert gazetteer.resolve(address="100 Peachtree St NW, Atlanta, GA 30303") == Place(
+        "Atlanta", "GA", "30303", 33.749, -84.388
+    )
+
+
+def test_resolves_city_after_street(gazetteer):
+    place = gazetteer.resolve(address="10 Main St St. Louis, MO")
+    assert (place.city, place.state) == ("Saint Louis", "MO")
+
+
+def test_ambiguous_city_without_state(gazetteer):
+    assert gazetteer.resolve(city="Arlington") is None
+    assert gazetteer.resolve(city="Arlington", state="VA").latitude == 38.8816
+
+
+def test_zip_from_another_state_is_dropped(gazetteer):
+    place = gazetteer.resolve(address="Chicago, IL 90210")
+    assert place == Place("Chicago", "IL", None, 41.8781, -87.6298)
+
+
+def test_exact_zip_without_city(gazetteer):
+    assert gazetteer.resolve(zip_code="60602") == Place("Chicago", "IL", "60602", 41.8781, -87.6298)
+
+
+def test_zip3_fallback_gives_only_state(gazetteer):
+    assert gazetteer.resolve(zip_code="60614") == Place(None, "IL", "60614", None, None)
+    # Addison, TX shares a prefix with Irving but must not become Irving
+    assert gazetteer.resolve(zip_code="75001") == Place(None, "TX", "75001", None, None)
+
+
+def test_unicode_digits_are_not_zip_codes(gazetteer):
+    assert gazetteer.resolve(zip_code="３０３０３") is None
+    assert parse_address("Atlanta, GA ３０３０３")[2] is None
+
+
+@pytest.mark.parametrize("address, city", [
+    ("North Las Vegas, NV", "North Las Vegas"),
+    ("North Charleston, SC", "North Charleston"),
+    ("South San Francisco, CA", "South San Francisco"),
+])
+def test_neighbouring_cities_are_not_merged(gazetteer, address, city):
+    assert gazetteer.resolve(address=address) == Place(city, address[-2:], None, None, None)
+
+
+def test_unknown_city_keeps_page_name_despite_zip_area(gazetteer):
+    assert gazetteer.resolve(address="North Las Vegas, NV 89030") == Place(
+        "North Las Vegas", "NV", "89030", None, None
+    )
+
+
+def test_table_zip_is_not_reported(gazetteer):
+    assert gazetteer.resolve(address="Atlanta, GA").zip_code is None
+    assert gazetteer.resolve(address="Suite 12345, 10 Main St, Boston, MA") == Place(
+        "Boston", "MA", None, 42.3601, -71.0589
+    )
+
+
+def test_resolve_many_memoizes_repeats(gazetteer):
+    queries = [{"address": "Atlanta, GA"}, {"address": "Atlanta, GA"}, {"city": "Boston", "state": "MA"}]
+    places = gazetteer.resolve_many(queries)
+    assert [place.city for place in places] == ["Atlanta", "Atlanta", "Boston"]
+    assert gazetteer.cache_info().misses == 2
+
+
+def test_index_is_rebuilt_when_table_changes(tmp_path):
+    table_path = str(tmp_path / "places.csv")
+    index_path = str(tmp_path / "places.idx")
+    shutil.copy(DEFAULT_TABLE_PATH, table_path)
+
+    g = Gazetteer(table_path=table_path, index_path=index_path)
+    assert g.lookup_city("Smalltown", "GA") is None
+    g.close()
+
+    with open(table_path, "a") as f:
+        f.write("Smalltown,GA,31000,32.0000,-83.0000\n")
+    # Make the index older than the edited table regardless of clock resolution
+    stale = os.path.getmtime(table_path) - 10
+    os.utime(index_path, (stale, stale))
+
+    g = Gazetteer(table_path=table_path, index_path=index_path)
+    assert g.lookup_city("Smalltown", "GA") == Place("Smalltown", "GA", "31000", 32.0, -83.0)
+    g.close()
+
+
+def test_city_listed_per_zip_is_merged(tmp_path):
+    table_path = tmp_path / "places.csv"
+    table_path.write_text(
+        "city,state,zip_code,latitude,longitude\n"
+        "Springfield,IL,62701,39.8000,-89.6500\n"
+        "Springfield,IL,62703,39.7000,-89.6300\n"
+        "Springfield,MA,01103,42.1000,-72.5900\n"
+    )
+    g = Gazetteer(table_path=str(table_path), index_path=str(tmp_path / "places.idx"))
+    assert g.lookup_city("Springfield", "IL") == Place("Springfield", "IL", None, 39.75, -89.64)
+    assert g.lookup_city("Springfield") is None
+    assert g.resolve(zip_code="62703") == Place("Springfield", "IL", "62703", 39.7, -89.63)
+    g.close()
+
+
+def test_fallback_index_is_keyed_on_table_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path / "tmp"))
+    os.makedirs(tempfile.tempdir)
+    indexes = []
+    for name in ("a", "b"):
+        table_dir = tmp_path / name
+        table_dir.mkdir()
+        shutil.copy(DEFAULT_TABLE_PATH, table_dir / "us_places.csv")
+        # An unwritable index path forces the temp-dir fallback
+        g = Gazetteer(
+            table_path=str(table_dir / "us_places.csv"),
+            index_path=str(tmp_path / "missing" / "us_places.idx"),
+        )
+        indexes.append(g.index_path)
+        g.close()
+    assert indexes[0] != indexes[1]
+    assert all(os.path.dirname(path) == tempfile.tempdir for path in indexes)
+    assert not [name for name in os.listdir(tempfile.tempdir) if name.endswith(".tmp")]
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for AddressResolutionPipeline
+"""
+
+import pytest
+
+scrapy = pytest.importorskip("scrapy")
+
+from k8_resources.gazetteer import Gazetteer, Place
+from k8_resources.items import K8ResourceItem
+from k8_resources.pipelines import AddressResolutionPipeline
+
+
+class PlainLocationItem(scrapy.Item):
+    # No latitude/longitude fields
+    address = scrapy.Field()
+    city = scrapy.Field()
+    state = scrapy.Field()
+    zip_code = scrapy.Field()
+
+
+class FlakyGazetteer:
+    """Fails batch resolution, and single resolution for one address"""
+
+    def resolve_many(self, queries):
+        raise RuntimeError("batch failed")
+
+    def resolve(self, address=None, city=None, state=None, zip_code=None):
+        if address == "boom":
+            raise RuntimeError("single failed")
+        return Place("Atlanta", "GA", None, 33.749, -84.388)
+
+
+@pytest.fixture
+def gazetteer(tmp_path):
+    g = Gazetteer(index_path=str(tmp_path / "us_places.idx"))
+    yield g
+    g.close()
+
+
+def process(pipeline, items):
+    """Feed items through process_item and collect what each Deferred yields"""
+    results = [None] * len(items)
+    for i, item in enumerate(items):
+        d = pipeline.process_item(item, spider=None)
+        d.addCallback(lambda value, i=i: results.__setitem__(i, value))
+    return results
+
+
+def test_batches_flush_at_batch_size(gazetteer):
+    pipeline = AddressResolutionPipeline(gazetteer, batch_size=2)
+    first = K8ResourceItem(address="100 Peachtree St NW, Atlanta, GA 30303")
+    second = K8ResourceItem(city="Boston", state="Massachusetts")
+    third = K8ResourceItem(address="Chicago, IL")
+
+    results = process(pipeline, [first, second, third])
+    assert results[:2] == [first, second]
+    assert results[2] is None
+    assert len(pipeline.pending) == 1
+
+    pipeline.flush()
+    assert results[2] is third
+    assert pipeline.pending == []
+
+
+def test_fields_are_written_back(gazetteer):
+    pipeline = AddressResolutionPipeline(gazetteer, batch_size=1)
+    item = K8ResourceItem(address="100 Peachtree St NW, Atlanta, GA 30303", city=" Atlanta", state="GA")
+    process(pipeline, [item])
+    assert (item['city'], item['state'], item['zip_code']) == ("Atlanta", "GA", "30303")
+    assert (item['latitude'], item['longitude']) == (33.749, -84.388)
+
+
+def test_undeclared_fields_are_skipped(gazetteer):
+    pipeline = AddressResolutionPipeline(gazetteer, batch_size=1)
+    item = PlainLocationItem(address="Chicago, IL 60602")
+    results = process(pipeline, [item])
+    assert results == [item]
+    assert dict(item) == {
+        'address': "Chicago, IL 60602", 'city': "Chicago", 'state': "IL", 'zip_code': "60602",
+    }
+
+
+def test_falls_back_to_per_item_resolution():
+    pipeline = AddressResolutionPipeline(FlakyGazetteer(), batch_size=2)
+    good = K8ResourceItem(address="Atlanta, GA")
+    bad = K8ResourceItem(address="boom", city="Somewhere")
+    results = process(pipeline, [good, bad])
+    assert results == [good, bad]
+    assert good['city'] == "Atlanta"
+    assert bad['city'] == "Somewhere"
+
+
+def test_every_deferred_fires_when_the_batch_fails(gazetteer):
+    pipeline = AddressResolutionPipeline(gazetteer, batch_size=3)
+    item = K8ResourceItem(address="Atlanta, GA")
+    not_an_item = object()
+    # ItemAdapter rejects the second entry, failing the whole batch
+    results = process(pipeline, [item, not_an_item, K8ResourceItem()])
+    assert results[0] is item
+    assert results[1] is not_an_item
+    assert results[2] is not None
+    assert pipeline.pending == []
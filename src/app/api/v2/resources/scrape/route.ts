@@ -1,6 +1,7 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { getCachedResources, saveCachedResources, getCacheStatus } from '@/services/resourceCache';
-import { connectToMongoDB } from '@/services/mongodb';
+import { connectToMongoDB, type Resource } from '@/services/mongodb';
+import { normalizeCity, normalizeState } from '@/lib/location';
 import { spawn } from 'child_process';
 import path from 'path';
 import fs from 'fs';
@@ -16,11 +17,22 @@ export async function POST(request: NextRequest) {
       );
     }
 
+    // Cache on the same canonical city/state the scraper's gazetteer uses,
+    // so "atlanta"/"Georgia" and "Atlanta"/"GA" share one entry
+    const cityKey = normalizeCity(city);
+    const stateCode = normalizeState(state);
+    if (!cityKey || !stateCode) {
+      return NextResponse.json(
+        { error: `Unknown city or state: ${city}, ${state}` },
+        { status: 400 }
+      );
+    }
+
     // Connect to MongoDB
     await connectToMongoDB();
 
     // Check if we already have cached resources for this city
-    const cachedResources = await getCachedResources(city, state);
+    const cachedResources = await getCachedResources(cityKey, stateCode);
     if (cachedResources) {
       console.log(`Returning ${cachedResources.length} cached resources for ${city}, ${state}`);
       return NextResponse.json({
@@ -130,16 +142,14 @@ except:
 
     const scrapedResources = await Promise.race([scrapePromise, timeoutPromise]) as Resource[];
 
-    // Process and save the scraped resources
+    // Keep the city/state/coordinates the scraper resolved for each resource
     const processedResources = scrapedResources.map((resource: Resource) => ({
       ...resource,
-      city: city,
-      state: state,
       scraped_at: new Date().toISOString()
     }));
 
     // Save to cache
-    await saveCachedResources(city, state, processedResources);
+    await saveCachedResources(cityKey, stateCode, processedResources);
 
     return NextResponse.json({
       success: true,
@@ -173,12 +183,23 @@ export async function GET(request: NextRequest) {
       );
     }
 
+    // Cache on the same canonical city/state the scraper's gazetteer uses,
+    // so "atlanta"/"Georgia" and "Atlanta"/"GA" share one entry
+    const cityKey = normalizeCity(city);
+    const stateCode = normalizeState(state);
+    if (!cityKey || !stateCode) {
+      return NextResponse.json(
+        { error: `Unknown city or state: ${city}, ${state}` },
+        { status: 400 }
+      );
+    }
+
     // Connect to MongoDB
     await connectToMongoDB();
 
     // Check cache status
-    const cacheStatus = await getCacheStatus(city, state);
-    const cachedResources = await getCachedResources(city, state);
+    const cacheStatus = await getCacheStatus(cityKey, stateCode);
+    const cachedResources = await getCachedResources(cityKey, stateCode);
 
     return NextResponse.json({
       success: true,
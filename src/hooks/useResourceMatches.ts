@@ -18,6 +18,8 @@ export interface Resource {
   city: string | null;
   state: string | null;
   zip_code: string | null;
+  latitude?: number | null;
+  longitude?: number | null;
   phone: string | null;
   email: string | null;
   website: string | null;
@@ -0,0 +1,29 @@
+import { normalizeCity, normalizeState } from '../location';
+
+describe('normalizeCity', () => {
+  it('should fold case, punctuation and common prefixes', () => {
+    expect(normalizeCity('Atlanta')).toBe('atlanta');
+    expect(normalizeCity('  atlanta ')).toBe('atlanta');
+    expect(normalizeCity('St. Louis')).toBe('saint louis');
+    expect(normalizeCity('Saint Louis')).toBe('saint louis');
+  });
+
+  it('should resolve aliases', () => {
+    expect(normalizeCity('NYC')).toBe('new york');
+    expect(normalizeCity('New York City')).toBe('new york');
+  });
+});
+
+describe('normalizeState', () => {
+  it('should accept abbreviations and full names', () => {
+    expect(normalizeState('GA')).toBe('GA');
+    expect(normalizeState('ga')).toBe('GA');
+    expect(normalizeState('Georgia')).toBe('GA');
+    expect(normalizeState('new york')).toBe('NY');
+  });
+
+  it('should reject unknown states', () => {
+    expect(normalizeState('Atlantis')).toBeNull();
+    expect(normalizeState('XX')).toBeNull();
+  });
+});
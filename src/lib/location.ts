@@ -0,0 +1,64 @@
+/**
+ * City/state normalization shared by the resource scrape route and cache.
+ *
+ * Mirrors normalize_city/normalize_state in
+ * resource-scraper/k8_resources/gazetteer.py so that a request for
+ * "atlanta"/"Georgia" and resources resolved by the scraper's gazetteer
+ * ("Atlanta"/"GA") land on the same cache key.
+ */
+
+const STATE_NAMES: Record<string, string> = {
+  alabama: 'AL', alaska: 'AK', arizona: 'AZ', arkansas: 'AR',
+  california: 'CA', colorado: 'CO', connecticut: 'CT', delaware: 'DE',
+  'district of columbia': 'DC', florida: 'FL', georgia: 'GA', hawaii: 'HI',
+  idaho: 'ID', illinois: 'IL', indiana: 'IN', iowa: 'IA',
+  kansas: 'KS', kentucky: 'KY', louisiana: 'LA', maine: 'ME',
+  maryland: 'MD', massachusetts: 'MA', michigan: 'MI', minnesota: 'MN',
+  mississippi: 'MS', missouri: 'MO', montana: 'MT', nebraska: 'NE',
+  nevada: 'NV', 'new hampshire': 'NH', 'new jersey': 'NJ', 'new mexico': 'NM',
+  'new york': 'NY', 'north carolina': 'NC', 'north dakota': 'ND', ohio: 'OH',
+  oklahoma: 'OK', oregon: 'OR', pennsylvania: 'PA', 'puerto rico': 'PR',
+  'rhode island': 'RI', 'south carolina': 'SC', 'south dakota': 'SD',
+  tennessee: 'TN', texas: 'TX', utah: 'UT', vermont: 'VT',
+  virginia: 'VA', washington: 'WA', 'west virginia': 'WV',
+  wisconsin: 'WI', wyoming: 'WY',
+  'washington dc': 'DC', 'd c': 'DC',
+};
+const STATE_CODES = new Set(Object.values(STATE_NAMES));
+
+const CITY_ALIASES: Record<string, string> = {
+  nyc: 'new york',
+  'new york city': 'new york',
+  manhattan: 'new york',
+  philly: 'philadelphia',
+  'washington dc': 'washington',
+};
+const CITY_PREFIXES: Record<string, string> = { st: 'saint', ste: 'sainte', ft: 'fort', mt: 'mount' };
+
+function words(value: string): string[] {
+  return value
+    .toLowerCase()
+    .replace(/[.']/g, '')
+    .replace(/[^a-z0-9\s]/g, ' ')
+    .split(/\s+/)
+    .filter(Boolean);
+}
+
+/** Lookup key for a city name, e.g. "St. Louis" -> "saint louis" */
+export function normalizeCity(city: string): string {
+  const parts = words(city);
+  if (parts.length && CITY_PREFIXES[parts[0]]) {
+    parts[0] = CITY_PREFIXES[parts[0]];
+  }
+  const key = parts.join(' ');
+  return CITY_ALIASES[key] ?? key;
+}
+
+/** Two-letter code for a state abbreviation or name, or null if unknown */
+export function normalizeState(state: string): string | null {
+  const text = state.trim().replace(/\.$/, '');
+  if (text.length === 2 && STATE_CODES.has(text.toUpperCase())) {
+    return text.toUpperCase();
+  }
+  return STATE_NAMES[words(text).join(' ')] ?? null;
+}